@@ -61,17 +61,19 @@ def dict_to_hdf5(
                         val_u = None
 
                     if isinstance(val_m, str):
-                        group.create_dataset(name=key, data=val_m, dtype=dt)
+                        dataset = group.create_dataset(name=key, data=val_m, dtype=dt)
                     elif isinstance(val_m, (float, int)):
-                        group.create_dataset(name=key, data=val_m)
+                        dataset = group.create_dataset(name=key, data=val_m)
                     elif isinstance(val_m, np.ndarray):
-                        group.create_dataset(name=key, data=val_m, shape=val_m.shape)
+                        dataset = group.create_dataset(
+                            name=key, data=val_m, shape=val_m.shape
+                        )
                     else:
                         raise ValueError(f"Type {type(val_m)} not recognized.")
                     if not val_u is None:
-                        group[key].attrs["u"] = val_u
+                        dataset.attrs["u"] = val_u
 
-                    group[key].attrs["format"] = series_info[key]
+                    dataset.attrs["format"] = series_info[key]
 
 
 class DatasetCuration(ABC):
@@ -152,24 +154,36 @@ class DatasetCuration(ABC):
         """
         Converts the units of properties in self.data to desired output values.
 
+        The conversion factor for each pair of input and output units is only looked up once,
+        as the unit lookup dominates the cost of converting many small arrays;
+        the magnitude of each quantity is then scaled by that factor.
+
         """
         import pint
 
         # this is needed for the "chem" context to convert hartrees to kj/mol
         from modelforge.utils.units import chem_context
 
+        # conversion factors, keyed by (key, input unit);
+        # None if the quantity is already in the output unit
+        factors = {}
+
         for datapoint in self.data:
             for key, val in datapoint.items():
                 if isinstance(val, pint.Quantity):
-                    try:
-                        datapoint[key] = val.to(
-                            self.qm_parameters[key]["u_out"], "chem"
-                        )
-                    except:
-                        # if the unit conversion can't be done
-                        raise Exception(
-                            f"could not convert {key} with unit {val.u} to {self.qm_parameters[key]['u_out']}"
-                        )
+                    u_out = self.qm_parameters[key]["u_out"]
+                    if (key, val.u) not in factors:
+                        try:
+                            factor = (1.0 * val.u).to(u_out, "chem").m
+                        except:
+                            # if the unit conversion can't be done
+                            raise Exception(
+                                f"could not convert {key} with unit {val.u} to {u_out}"
+                            )
+                        factors[(key, val.u)] = None if val.u == u_out else factor
+                    factor = factors[(key, val.u)]
+                    if factor is not None:
+                        datapoint[key] = val.m * factor * u_out
 
     @property
     def total_conformers(self) -> int:
@@ -1,4 +1,7 @@
-from typing import List, Tuple, Dict, Optional
+from functools import lru_cache
+from typing import Any, Iterable, List, Tuple, Dict, Optional
+
+import numpy as np
 
 from modelforge.curation.curation_baseclass import *
 from modelforge.utils.io import import_
@@ -7,6 +10,333 @@ retry = import_("retry").retry
 from tqdm import tqdm
 from openff.units import unit
 
+# Reference energies, in hartrees, computed with Psi4 1.5 wB97M-D3BJ/def2-TZVPPD.
+_ATOM_ENERGY = {
+    "Br": {-1: -2574.2451510945853, 0: -2574.1167240829964},
+    "C": {-1: -37.91424135791358, 0: -37.87264507233593, 1: -37.45349214963933},
+    "Ca": {2: -676.9528465198214},
+    "Cl": {-1: -460.3350243496703, 0: -460.1988762285739},
+    "F": {-1: -99.91298732343974, 0: -99.78611622985483},
+    "H": {-1: -0.5027370838721259, 0: -0.4987605100487531, 1: 0.0},
+    "I": {-1: -297.8813829975981, 0: -297.76228914445625},
+    "K": {1: -599.8025677513111},
+    "Li": {1: -7.285254714046546},
+    "Mg": {2: -199.2688420040449},
+    "N": {
+        -1: -54.602291095426494,
+        0: -54.62327513368922,
+        1: -54.08594142587869,
+    },
+    "Na": {1: -162.11366478783253},
+    "O": {-1: -75.17101657391741, 0: -75.11317840410095, 1: -74.60241514396725},
+    "P": {0: -341.3059197024934, 1: -340.9258392474849},
+    "S": {-1: -398.2405387031612, 0: -398.1599636677874, 1: -397.7746615977658},
+}
+
+# the charge state with the lowest reference energy for each element
+_DEFAULT_CHARGE = {
+    symbol: min((energy, charge) for charge, energy in energies.items())[1]
+    for symbol, energies in _ATOM_ENERGY.items()
+}
+
+# the reference energies arranged as an (n_elements, n_charge_states) array, with nan
+# for charge states that are not defined for an element. Column j corresponds to a
+# charge of _MIN_CHARGE + j.
+_ELEMENT_INDEX = {symbol: i for i, symbol in enumerate(_ATOM_ENERGY)}
+_MIN_CHARGE = min(min(energies) for energies in _ATOM_ENERGY.values())
+_MAX_CHARGE = max(max(energies) for energies in _ATOM_ENERGY.values())
+_ENERGY_TABLE = np.full((len(_ATOM_ENERGY), _MAX_CHARGE - _MIN_CHARGE + 1), np.nan)
+for _symbol, _energies in _ATOM_ENERGY.items():
+    for _charge, _energy in _energies.items():
+        _ENERGY_TABLE[_ELEMENT_INDEX[_symbol], _charge - _MIN_CHARGE] = _energy
+
+
+# settings applied to each connection to the local sqlite databases:
+# write-ahead logging allows the tables to be read while other threads are still
+# writing to the same file, and a larger page cache and memory mapping
+# reduce the cost of the many small reads made when processing the records.
+_SQLITE_PRAGMAS = [
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-262144",
+    "PRAGMA mmap_size=30000000000",
+]
+
+
+def _open_sqlite_dict(file_name: str, tablename: str, autocommit: bool = False):
+    """
+    Open a table in a local sqlite database as a SqliteDict, using write-ahead logging.
+
+    Parameters
+    ----------
+    file_name: str, required
+        Path to the sqlite database.
+    tablename: str, required
+        Name of the table to open.
+    autocommit: bool, optional, default=False
+        If True, commit after every write.
+
+    Returns
+    -------
+    SqliteDict
+        The opened table; can be used as a context manager.
+    """
+    SqliteDict = import_("sqlitedict").SqliteDict
+    # from sqlitedict import SqliteDict
+
+    # outer_stack=False avoids capturing a traceback for every query
+    sqlite_dict = SqliteDict(
+        file_name,
+        tablename=tablename,
+        autocommit=autocommit,
+        journal_mode="WAL",
+        outer_stack=False,
+    )
+    for pragma in _SQLITE_PRAGMAS:
+        sqlite_dict.conn.execute(pragma)
+    return sqlite_dict
+
+
+def _iterate_sqlite_dict_values(sqlite_dict, keys: List[str], batch_size: int = 900):
+    """
+    Iterate over the values stored in a SqliteDict for a list of keys, in the order of the keys.
+
+    Rather than issuing a separate query for each key (as done by sqlite_dict[key]),
+    the values are selected in batches with a single query per batch.
+
+    Parameters
+    ----------
+    sqlite_dict: SqliteDict, required
+        Open SqliteDict table to read from.
+    keys: List[str], required
+        Keys of the values to read.
+    batch_size: int, optional, default=900
+        Number of keys to select per query; this is kept below 999,
+        the limit on the number of parameters in a query in older versions of sqlite.
+
+    Yields
+    ------
+    Tuple[str, Any]
+        The key and the decoded value stored for that key.
+    """
+    query = f'SELECT key, value FROM "{sqlite_dict.tablename}" WHERE key IN '
+
+    for start in range(0, len(keys), batch_size):
+        batch = keys[start : start + batch_size]
+        encoded_keys = [sqlite_dict.encode_key(key) for key in batch]
+        rows = dict(
+            sqlite_dict.conn.select(
+                query + f"({','.join(['?'] * len(batch))})", encoded_keys
+            )
+        )
+        for key, encoded_key in zip(batch, encoded_keys):
+            if encoded_key not in rows:
+                raise KeyError(key)
+            yield key, sqlite_dict.decode(rows[encoded_key])
+
+
+def _write_sqlite_dict_values(
+    file_name: str,
+    tablename: str,
+    items: Iterable[Tuple[str, Any]],
+    batch_size: int = 500,
+    pbar: Optional[tqdm] = None,
+):
+    """
+    Write key/value pairs to a table in a local sqlite database, in the format used by SqliteDict.
+
+    Values are pickled as SqliteDict does, so the table can be read with _open_sqlite_dict,
+    but are written with a plain sqlite3 connection: each batch is inserted with a single
+    executemany call and committed once, rather than passing every write through
+    the queue of the SqliteDict worker thread.
+
+    Parameters
+    ----------
+    file_name: str, required
+        Path to the sqlite database.
+    tablename: str, required
+        Name of the table to write to; created if it does not exist.
+    items: Iterable[Tuple[str, Any]], required
+        Keys and values to write; values are replaced if the key already exists.
+    batch_size: int, optional, default=500
+        Number of items to write per transaction.
+    pbar: Optional[tqdm], optional, default=None
+        Progress bar, updated after each batch is committed.
+    """
+    import sqlite3
+    from itertools import islice
+
+    sqlitedict = import_("sqlitedict")
+    # import sqlitedict
+
+    # other threads may be writing other tables in the same file,
+    # so wait for the write lock rather than failing
+    conn = sqlite3.connect(file_name, timeout=60)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        for pragma in _SQLITE_PRAGMAS:
+            conn.execute(pragma)
+        with conn:
+            conn.execute(
+                f'CREATE TABLE IF NOT EXISTS "{tablename}" (key TEXT PRIMARY KEY, value BLOB)'
+            )
+
+        query = f'REPLACE INTO "{tablename}" (key, value) VALUES (?,?)'
+        items = iter(items)
+        while True:
+            batch = [
+                (key, sqlitedict.encode(value))
+                for key, value in islice(items, batch_size)
+            ]
+            if len(batch) == 0:
+                break
+            # the connection context manager commits the transaction
+            with conn:
+                conn.executemany(query, batch)
+            if pbar is not None:
+                pbar.update(len(batch))
+    finally:
+        conn.close()
+
+
+# the properties of each specification that are used when processing the records
+_SPECIFICATION_PROPERTIES = {
+    "spec_2": [
+        "dft total energy",
+        "dft total gradient",
+        "mbis charges",
+        "scf dipole",
+    ],
+    "spec_6": [
+        "dispersion correction energy",
+        "dispersion correction gradient",
+    ],
+}
+
+
+def _minimal_entry(entry: Dict) -> Dict:
+    """
+    Extract the fields of a QCArchive dataset entry that are used when processing the records.
+
+    Parameters
+    ----------
+    entry: Dict, required
+        Dictionary representation of the entry, i.e., entry.dict().
+
+    Returns
+    -------
+    Dict
+        Dictionary with the same layout as the entry, restricted to the fields that are used.
+    """
+    molecule = entry["molecule"]
+    return {
+        "name": entry["name"],
+        "molecule": {
+            "symbols": molecule["symbols"],
+            "geometry": molecule["geometry"],
+            "identifiers": {
+                "molecular_formula": molecule["identifiers"]["molecular_formula"]
+            },
+            "extras": {
+                "canonical_isomeric_explicit_hydrogen_mapped_smiles": molecule[
+                    "extras"
+                ]["canonical_isomeric_explicit_hydrogen_mapped_smiles"]
+            },
+        },
+    }
+
+
+def _minimal_record(record: Dict, specification_name: str) -> Dict:
+    """
+    Extract the status and the properties of a QCArchive record that are used when processing the records.
+
+    Parameters
+    ----------
+    record: Dict, required
+        Dictionary representation of the record, i.e., record.dict().
+    specification_name: str, required
+        Name of the specification of the record; defines which properties are retained.
+
+    Returns
+    -------
+    Dict
+        Dictionary with the same layout as the record, restricted to the fields that are used.
+    """
+    # records that did not complete may not have any properties
+    properties = record["properties"] or {}
+    return {
+        "status": record["status"],
+        "properties": {
+            key: properties[key]
+            for key in _SPECIFICATION_PROPERTIES[specification_name]
+            if key in properties
+        },
+    }
+
+
+# the quantities that are stored for each conformer of a molecule when processing the records;
+# these are allocated by SPICE1OpenFFCuration._allocate_conformer_arrays
+_CONFORMER_QUANTITIES = (
+    "geometry",
+    "dft_total_energy",
+    "dft_total_gradient",
+    "mbis_charges",
+    "scf_dipole",
+    "dispersion_correction_energy",
+    "dispersion_correction_gradient",
+)
+
+
+@lru_cache(maxsize=None)
+def _reference_energy_and_charge_from_smiles(smiles: str) -> Tuple[float, int]:
+    """
+    Calculate the reference energy (in hartrees) and total charge of a molecule defined by a SMILES string.
+
+    Results are cached, since many molecules share the same SMILES string.
+    See SPICE1OpenFFCuration._calculate_reference_energy_and_charge.
+
+    Parameters
+    ----------
+    smiles: str, required
+        SMILES string describing the molecule of interest.
+
+    Returns
+    -------
+    Tuple[float, int]
+        Reference energy of the atoms in the molecule (in hartrees) and the total charge of the molecule.
+    """
+    Chem = import_("rdkit.Chem")
+    # from rdkit import Chem
+
+    rdmol = Chem.MolFromSmiles(smiles, sanitize=False)
+    total_charge = sum(atom.GetFormalCharge() for atom in rdmol.GetAtoms())
+    symbol = [atom.GetSymbol() for atom in rdmol.GetAtoms()]
+
+    atoms = np.arange(len(symbol))
+    energies = _ENERGY_TABLE[[_ELEMENT_INDEX[s] for s in symbol]]
+    # column of energies that corresponds to the charge currently assigned to each atom
+    charge_index = np.array([_DEFAULT_CHARGE[s] for s in symbol]) - _MIN_CHARGE
+
+    delta = np.sign(total_charge - np.sum(charge_index + _MIN_CHARGE))
+    while delta != 0:
+        # change in energy for each atom if its charge is shifted by delta;
+        # nan if the shifted charge is not defined for that element
+        new_index = charge_index + delta
+        valid = (new_index >= 0) & (new_index < energies.shape[1])
+        energy_change = np.full(len(symbol), np.nan)
+        energy_change[valid] = (
+            energies[atoms[valid], new_index[valid]]
+            - energies[atoms[valid], charge_index[valid]]
+        )
+        best_index = np.nanargmin(energy_change)
+
+        charge_index[best_index] += delta
+        delta = np.sign(total_charge - np.sum(charge_index + _MIN_CHARGE))
+
+    return (
+        float(np.sum(energies[atoms, charge_index])),
+        int(total_charge),
+    )
+
 
 class SPICE1OpenFFCuration(DatasetCuration):
     """
@@ -206,8 +536,6 @@ class SPICE1OpenFFCuration(DatasetCuration):
 
         """
 
-        SqliteDict = import_("sqlitedict").SqliteDict
-        # from sqlitedict import SqliteDict
         from loguru import logger
 
         PortalClient = import_("qcportal").PortalClient
@@ -224,58 +552,70 @@ class SPICE1OpenFFCuration(DatasetCuration):
         entry_names = ds.entry_names
         if max_records is None:
             max_records = len(entry_names)
-        with SqliteDict(
+        with _open_sqlite_dict(
             f"{local_path_dir}/{local_database_name}",
             tablename=specification_name,
-            autocommit=True,
         ) as spice_db:
             # defining the db_keys as a set is faster for
             # searching to see if a key exists
             db_keys = set(spice_db.keys())
-            to_fetch = []
-            if force_download:
-                for name in entry_names[0:max_records]:
+        to_fetch = []
+        if force_download:
+            for name in entry_names[0:max_records]:
+                to_fetch.append(name)
+        else:
+            for name in entry_names[0:max_records]:
+                if name not in db_keys:
                     to_fetch.append(name)
-            else:
-                for name in entry_names[0:max_records]:
-                    if name not in db_keys:
-                        to_fetch.append(name)
-            if pbar is not None:
-                pbar.total = pbar.total + len(to_fetch)
-                pbar.refresh()
-
-            # We need a different routine to fetch entries vs records with a give specification
-            if len(to_fetch) > 0:
-                if specification_name == "entry":
-                    logger.debug(
-                        f"Fetching {len(to_fetch)} entries from dataset {dataset_name}."
-                    )
+        if pbar is not None:
+            pbar.total = pbar.total + len(to_fetch)
+            pbar.refresh()
+
+        # We need a different routine to fetch entries vs records with a give specification
+        if len(to_fetch) > 0:
+            if specification_name == "entry":
+                logger.debug(
+                    f"Fetching {len(to_fetch)} entries from dataset {dataset_name}."
+                )
+                fetched = (
+                    (entry.name, _minimal_entry(entry.dict()))
                     for entry in ds.iterate_entries(
                         to_fetch, force_refetch=force_download
-                    ):
-                        spice_db[entry.dict()["name"]] = entry
-                        if pbar is not None:
-                            pbar.update(1)
-
-                else:
-                    logger.debug(
-                        f"Fetching {len(to_fetch)} records for {specification_name} from dataset {dataset_name}."
                     )
+                )
+
+            else:
+                logger.debug(
+                    f"Fetching {len(to_fetch)} records for {specification_name} from dataset {dataset_name}."
+                )
+                fetched = (
+                    (record[0], _minimal_record(record[2].dict(), specification_name))
                     for record in ds.iterate_records(
                         to_fetch,
                         specification_names=[specification_name],
                         force_refetch=force_download,
-                    ):
-                        spice_db[record[0]] = record[2].dict()
-                        if pbar is not None:
-                            pbar.update(1)
+                    )
+                )
 
+            # the records are written, and the progress bar updated, in batches
+            # rather than after every record
+            _write_sqlite_dict_values(
+                f"{local_path_dir}/{local_database_name}",
+                tablename=specification_name,
+                items=fetched,
+                pbar=pbar,
+            )
+
+    @staticmethod
     def _calculate_reference_energy_and_charge(
-        self, smiles: str
+        smiles: str,
     ) -> Tuple[unit.Quantity, unit.Quantity]:
         """
         Calculate the reference energy for a given molecule, as defined by the SMILES string.
 
+        The calculation is cached by _reference_energy_and_charge_from_smiles;
+        this method attaches the units and is also used by _process_sqlite_file.
+
         This routine is taken from
         https://github.com/openmm/spice-dataset/blob/df7f5a2c8bf1ce0db225715a81f32897cc3a8988/downloader/downloader-openff-default.py
         Reference energies for individual atoms are computed with Psi4 1.5 wB97M-D3BJ/def2-TZVPPD.
@@ -291,67 +631,15 @@ class SPICE1OpenFFCuration(DatasetCuration):
             Returns the reference energy of for the atoms in the molecule (in hartrees)
             and the total charge of the molecule (in elementary charge).
         """
-        Chem = import_("rdkit.Chem")
-        # from rdkit import Chem
-        import numpy as np
-
-        # Reference energies, in hartrees, computed with Psi4 1.5 wB97M-D3BJ/def2-TZVPPD.
-
-        atom_energy = {
-            "Br": {-1: -2574.2451510945853, 0: -2574.1167240829964},
-            "C": {-1: -37.91424135791358, 0: -37.87264507233593, 1: -37.45349214963933},
-            "Ca": {2: -676.9528465198214},
-            "Cl": {-1: -460.3350243496703, 0: -460.1988762285739},
-            "F": {-1: -99.91298732343974, 0: -99.78611622985483},
-            "H": {-1: -0.5027370838721259, 0: -0.4987605100487531, 1: 0.0},
-            "I": {-1: -297.8813829975981, 0: -297.76228914445625},
-            "K": {1: -599.8025677513111},
-            "Li": {1: -7.285254714046546},
-            "Mg": {2: -199.2688420040449},
-            "N": {
-                -1: -54.602291095426494,
-                0: -54.62327513368922,
-                1: -54.08594142587869,
-            },
-            "Na": {1: -162.11366478783253},
-            "O": {-1: -75.17101657391741, 0: -75.11317840410095, 1: -74.60241514396725},
-            "P": {0: -341.3059197024934, 1: -340.9258392474849},
-            "S": {-1: -398.2405387031612, 0: -398.1599636677874, 1: -397.7746615977658},
-        }
-        default_charge = {}
-        for symbol in atom_energy:
-            energies = [
-                (energy, charge) for charge, energy in atom_energy[symbol].items()
-            ]
-            default_charge[symbol] = sorted(energies)[0][1]
-
-        rdmol = Chem.MolFromSmiles(smiles, sanitize=False)
-        total_charge = sum(atom.GetFormalCharge() for atom in rdmol.GetAtoms())
-        symbol = [atom.GetSymbol() for atom in rdmol.GetAtoms()]
-        charge = [default_charge[s] for s in symbol]
-        delta = np.sign(total_charge - sum(charge))
-        while delta != 0:
-            best_index = -1
-            best_energy = None
-            for i in range(len(symbol)):
-                s = symbol[i]
-                e = atom_energy[s]
-                new_charge = charge[i] + delta
-
-                if new_charge in e:
-                    if best_index == -1 or e[new_charge] - e[charge[i]] < best_energy:
-                        best_index = i
-                        best_energy = e[new_charge] - e[charge[i]]
-
-            charge[best_index] += delta
-            delta = np.sign(total_charge - sum(charge))
+        energy, total_charge = _reference_energy_and_charge_from_smiles(smiles)
 
         return (
-            sum(atom_energy[s][c] for s, c in zip(symbol, charge)) * unit.hartree,
-            int(total_charge) * unit.elementary_charge,
+            energy * unit.hartree,
+            total_charge * unit.elementary_charge,
         )
 
-    def _sort_keys(self, non_error_keys: List[str]) -> Tuple[List[str], Dict[str, str]]:
+    @staticmethod
+    def _sort_keys(non_error_keys: List[str]) -> Tuple[List[str], Dict[str, str]]:
         """
         This will sort record identifiers such that conformers are listed in numerical order.
 
@@ -378,6 +666,10 @@ class SPICE1OpenFFCuration(DatasetCuration):
         non_error_keys_sanitized = []
         original_name = {}
 
+        # the molecule name and conformer number of each key, used for sorting
+        molecule_names = []
+        conformer_numbers = []
+
         for key in non_error_keys:
             s = "_"
             d = "-"
@@ -385,6 +677,8 @@ class SPICE1OpenFFCuration(DatasetCuration):
             name = d.join([s.join(temp[0:-1]), temp[-1]])
             non_error_keys_sanitized.append(name)
             original_name[name] = key
+            molecule_names.append(s.join(temp[0:-1]))
+            conformer_numbers.append(int(temp[-1]))
 
         # We will sort the keys such that conformers are listed in numerical order.
         # This is not strictly necessary, but will help to better retain
@@ -396,34 +690,224 @@ class SPICE1OpenFFCuration(DatasetCuration):
         # index of the conformers in the combined arrays.  This should not be an issue in terms of training,
         # but could cause some confusion when interrogating a specific set of conformers geometries for a molecule.
 
-        sorted_keys = []
-
         # names of the molecules are of form  {name}-{conformer_number}
-        # first sort by name
-        s = "_"
-        pre_sort = sorted(non_error_keys_sanitized, key=lambda x: (x.split("-")[0]))
+        # we sort by name, then by conformer number (np.lexsort uses the last array as the primary key).
+        # np.lexsort is stable, as is the sort of the names, so the order of any duplicate keys is retained.
+        order = np.lexsort(
+            (
+                np.array(conformer_numbers, dtype=np.int64),
+                np.array(molecule_names, dtype=str),
+            )
+        )
+        sorted_keys = [non_error_keys_sanitized[i] for i in order]
 
-        # then sort each molecule by conformer_number
-        # we'll do this by simple iteration through the list, and when we encounter a new molecule name, we'll sort the
-        # previous temporary list we generated.
-        current_val = pre_sort[0].split("-")[0]
-        temp_list = []
+        return sorted_keys, original_name
 
-        for val in pre_sort:
-            name = val.split("-")[0]
+    @staticmethod
+    def _allocate_conformer_arrays(
+        n_configs: int, n_atoms: int
+    ) -> Dict[str, np.ndarray]:
+        """
+        Allocate the arrays that hold the per-conformer quantities of a single molecule.
 
-            if name == current_val:
-                temp_list.append(val)
-            else:
-                sorted_keys += sorted(temp_list, key=lambda x: int(x.split("-")[-1]))
-                temp_list = []
-                current_val = name
-                temp_list.append(val)
+        The arrays are filled by index in _process_sqlite_file,
+        which avoids repeatedly reallocating them as each conformer is read.
 
-        # sort the final batch
-        sorted_keys += sorted(temp_list, key=lambda x: int(x.split("-")[-1]))
+        Parameters
+        ----------
+        n_configs: int, required
+            Number of conformers of the molecule.
+        n_atoms: int, required
+            Number of atoms in the molecule.
 
-        return sorted_keys, original_name
+        Returns
+        -------
+        Dict[str, np.ndarray]
+            Dictionary of uninitialized arrays, keyed by the names in _CONFORMER_QUANTITIES.
+        """
+        # shape of each quantity for a single conformer
+        conformer_shapes = {
+            "geometry": (n_atoms, 3),
+            "dft_total_energy": (1,),
+            "dft_total_gradient": (n_atoms, 3),
+            "mbis_charges": (n_atoms, 1),
+            "scf_dipole": (3,),
+            "dispersion_correction_energy": (1,),
+            "dispersion_correction_gradient": (n_atoms, 3),
+        }
+
+        return {
+            quantity: np.empty(
+                (n_configs, *conformer_shapes[quantity]), dtype=np.float64
+            )
+            for quantity in _CONFORMER_QUANTITIES
+        }
+
+    @staticmethod
+    def _process_sqlite_file(input_file_name: str, dataset_name: str) -> List[Dict]:
+        """
+        Extracts the relevant information from a single downloaded sqlite file.
+
+        This does not modify the class instance, so that multiple files can be processed
+        in separate processes; it is called by _process_downloaded.
+
+        Parameters
+        ----------
+        input_file_name: str, required
+            Path to the sqlite file to process.
+        dataset_name: str, required
+            Name of the dataset stored in the sqlite file.
+
+        Returns
+        -------
+        List[Dict]
+            List of dictionaries, one per molecule, with all conformers of the molecule grouped together.
+            Quantities do not yet have units attached.
+        """
+        from collections import Counter
+        from contextlib import ExitStack
+
+        from loguru import logger
+
+        qcel = import_("qcelemental")
+
+        # look up the atomic numbers once, rather than for every atom of every molecule
+        atomic_number = {
+            symbol: qcel.periodictable.to_atomic_number(symbol)
+            for symbol in qcel.periodictable.E
+        }
+
+        data = []
+        molecule_names = {}
+
+        # the entry and both specifications are stored as separate tables in the same file;
+        # open each once and read all three for a given key in the same pass
+        with ExitStack() as stack:
+            spice_db_entry = stack.enter_context(
+                _open_sqlite_dict(input_file_name, tablename="entry")
+            )
+            spice_db_spec2 = stack.enter_context(
+                _open_sqlite_dict(input_file_name, tablename="spec_2")
+            )
+            spice_db_spec6 = stack.enter_context(
+                _open_sqlite_dict(input_file_name, tablename="spec_6")
+            )
+
+            # identify the set of molecules that do not have errors
+            non_error_keys = []
+            spec2_keys = list(spice_db_spec2.keys())
+            for (key, spec2_val), (_, spec6_val) in zip(
+                _iterate_sqlite_dict_values(spice_db_spec2, spec2_keys),
+                _iterate_sqlite_dict_values(spice_db_spec6, spec2_keys),
+            ):
+                if (
+                    spec2_val["status"].value == "complete"
+                    and spec6_val["status"].value == "complete"
+                ):
+                    non_error_keys.append(key)
+
+            sorted_keys, original_name = SPICE1OpenFFCuration._sort_keys(non_error_keys)
+
+            # the sanitized keys are of the form {name}-{conformer_number};
+            # split each key once and reuse the name in the loops below
+            names = [key.split("-")[0] for key in sorted_keys]
+
+            # count the number of conformers of each molecule up front, so that we can
+            # allocate the arrays for each molecule once and fill them by index,
+            # rather than growing them with vstack for every conformer
+            conformer_counts = Counter(names)
+
+            # index of the next conformer to be written for each molecule
+            conformer_index = {}
+
+            logger.debug(f"Processing {input_file_name}.")
+            original_keys = [original_name[key] for key in sorted_keys]
+            for name, (_, entry_val), (_, spec2_val), (_, spec6_val) in zip(
+                names,
+                _iterate_sqlite_dict_values(spice_db_entry, original_keys),
+                _iterate_sqlite_dict_values(spice_db_spec2, original_keys),
+                _iterate_sqlite_dict_values(spice_db_spec6, original_keys),
+            ):
+                # databases written by earlier versions store the full entry object
+                val = entry_val if isinstance(entry_val, dict) else entry_val.dict()
+                # if we haven't processed a molecule with this name yet
+                # we will add to the molecule_names dictionary
+                if name not in molecule_names.keys():
+                    molecule_names[name] = len(data)
+
+                    data_temp = {}
+                    data_temp["name"] = name
+                    data_temp["source"] = input_file_name.replace(".sqlite", "")
+                    atomic_numbers = [
+                        atomic_number[element] for element in val["molecule"]["symbols"]
+                    ]
+                    data_temp["atomic_numbers"] = np.array(atomic_numbers).reshape(
+                        -1, 1
+                    )
+                    data_temp["molecular_formula"] = val["molecule"]["identifiers"][
+                        "molecular_formula"
+                    ]
+                    data_temp["canonical_isomeric_explicit_hydrogen_mapped_smiles"] = (
+                        val["molecule"]["extras"][
+                            "canonical_isomeric_explicit_hydrogen_mapped_smiles"
+                        ]
+                    )
+                    data_temp["n_configs"] = conformer_counts[name]
+                    data_temp.update(
+                        SPICE1OpenFFCuration._allocate_conformer_arrays(
+                            conformer_counts[name], len(atomic_numbers)
+                        )
+                    )
+                    # units are attached to all quantities in _process_downloaded
+                    reference_energy, total_charge = (
+                        SPICE1OpenFFCuration._calculate_reference_energy_and_charge(
+                            data_temp[
+                                "canonical_isomeric_explicit_hydrogen_mapped_smiles"
+                            ]
+                        )
+                    )
+                    data_temp["reference_energy"] = reference_energy.m_as(unit.hartree)
+                    data_temp["total_charge"] = total_charge.m_as(
+                        unit.elementary_charge
+                    )
+                    data_temp["dataset_name"] = dataset_name
+                    data.append(data_temp)
+                    conformer_index[name] = 0
+
+                datapoint = data[molecule_names[name]]
+                row = conformer_index[name]
+                conformer_index[name] += 1
+
+                datapoint["geometry"][row] = np.asarray(
+                    val["molecule"]["geometry"], dtype=np.float64
+                ).reshape(-1, 3)
+
+                # note, we will use the convention of names being lowercase
+                # and spaces denoted by underscore
+                datapoint["dft_total_energy"][row] = spec2_val["properties"][
+                    "dft total energy"
+                ]
+                datapoint["dft_total_gradient"][row] = np.asarray(
+                    spec2_val["properties"]["dft total gradient"], dtype=np.float64
+                ).reshape(-1, 3)
+                datapoint["mbis_charges"][row] = np.asarray(
+                    spec2_val["properties"]["mbis charges"], dtype=np.float64
+                ).reshape(-1, 1)
+                datapoint["scf_dipole"][row] = np.asarray(
+                    spec2_val["properties"]["scf dipole"], dtype=np.float64
+                ).reshape(3)
+
+                # Note need to typecast here because of a bug in the
+                # qcarchive entry: see issue: https://github.com/MolSSI/QCFractal/issues/766
+                datapoint["dispersion_correction_energy"][row] = float(
+                    spec6_val["properties"]["dispersion correction energy"]
+                )
+                datapoint["dispersion_correction_gradient"][row] = np.asarray(
+                    spec6_val["properties"]["dispersion correction gradient"],
+                    dtype=np.float64,
+                ).reshape(-1, 3)
+
+        return data
 
     def _process_downloaded(
         self,
@@ -433,10 +917,17 @@ class SPICE1OpenFFCuration(DatasetCuration):
         max_conformers_per_record: Optional[int] = None,
         total_conformers: Optional[int] = None,
         atomic_numbers_to_limit: Optional[List[int]] = None,
+        n_workers: Optional[int] = 1,
     ):
         """
         Processes a downloaded dataset: extracts relevant information.
 
+        With n_workers > 1, the sqlite files are processed in separate processes.
+        On platforms that start processes with spawn (macOS and Windows), the calling script
+        must then guard its entry point with `if __name__ == "__main__":`.
+        Each worker opens three connections to its sqlite file, each with a page cache of up to 256 MB
+        (see _SQLITE_PRAGMAS), so memory use grows with the number of workers.
+
         Parameters
         ----------
         local_path_dir: str, required
@@ -451,241 +942,80 @@ class SPICE1OpenFFCuration(DatasetCuration):
             If set, this will limit the total number of conformers to the specified number.
         atomic_numbers_to_limit: Optional[List[int]], optional, default=None
             If set, this will limit the dataset to only include molecules with atomic numbers in the list.
+        n_workers: Optional[int], optional, default=1
+            Number of processes used to process the sqlite files; if 1, the files are processed
+            in the calling process. If None, the number of CPUs is used.
         """
+        import os
+        from concurrent.futures import ProcessPoolExecutor
+        from contextlib import ExitStack
         from tqdm import tqdm
-        import numpy as np
 
-        SqliteDict = import_("sqlitedict").SqliteDict
-        # from sqlitedict import SqliteDict
-        from loguru import logger
-
-        qcel = import_("qcelemental")
-        from numpy import newaxis
+        input_file_names = [f"{local_path_dir}/{filename}" for filename in filenames]
 
-        for filename, dataset_name in zip(filenames, dataset_names):
-            input_file_name = f"{local_path_dir}/{filename}"
+        if n_workers is None:
+            n_workers = os.cpu_count() or 1
+        n_workers = max(1, min(len(filenames), n_workers))
 
-            non_error_keys = []
+        with ExitStack() as stack:
+            if n_workers > 1:
+                executor = stack.enter_context(
+                    ProcessPoolExecutor(max_workers=n_workers)
+                )
+                # map returns the results in the order of the input files,
+                # so the order of the records does not depend on which process finishes first
+                file_data = executor.map(
+                    self._process_sqlite_file, input_file_names, dataset_names
+                )
+            else:
+                file_data = map(
+                    self._process_sqlite_file, input_file_names, dataset_names
+                )
 
-            # identify the set of molecules that do not have errors
-            with SqliteDict(
-                input_file_name, tablename="spec_2", autocommit=False
-            ) as spice_db_spec2:
-                spec2_keys = list(spice_db_spec2.keys())
-
-                with SqliteDict(
-                    input_file_name, tablename="spec_6", autocommit=False
-                ) as spice_db_spec6:
-                    for key in spec2_keys:
-                        if (
-                            spice_db_spec2[key]["status"].value == "complete"
-                            and spice_db_spec6[key]["status"].value == "complete"
-                        ):
-                            non_error_keys.append(key)
-
-            sorted_keys, original_name = self._sort_keys(non_error_keys)
-
-            # first read in molecules from entry
-            with SqliteDict(
-                input_file_name, tablename="entry", autocommit=False
-            ) as spice_db:
-                logger.debug(f"Processing {filename} entries.")
-                for key in tqdm(sorted_keys):
-                    val = spice_db[original_name[key]].dict()
-                    name = key.split("-")[0]
-                    # if we haven't processed a molecule with this name yet
-                    # we will add to the molecule_names dictionary
+            for data in tqdm(file_data, total=len(filenames)):
+                for datapoint in data:
+                    name = datapoint["name"]
                     if name not in self.molecule_names.keys():
                         self.molecule_names[name] = len(self.data)
-
-                        data_temp = {}
-                        data_temp["name"] = name
-                        data_temp["source"] = input_file_name.replace(".sqlite", "")
-                        atomic_numbers = []
-                        for element in val["molecule"]["symbols"]:
-                            atomic_numbers.append(
-                                qcel.periodictable.to_atomic_number(element)
-                            )
-                        data_temp["atomic_numbers"] = np.array(atomic_numbers).reshape(
-                            -1, 1
-                        )
-                        data_temp["molecular_formula"] = val["molecule"]["identifiers"][
-                            "molecular_formula"
-                        ]
-                        data_temp[
-                            "canonical_isomeric_explicit_hydrogen_mapped_smiles"
-                        ] = val["molecule"]["extras"][
-                            "canonical_isomeric_explicit_hydrogen_mapped_smiles"
-                        ]
-                        data_temp["n_configs"] = 1
-                        data_temp["geometry"] = val["molecule"]["geometry"].reshape(
-                            1, -1, 3
-                        )
-                        (
-                            data_temp["reference_energy"],
-                            data_temp["total_charge"],
-                        ) = self._calculate_reference_energy_and_charge(
-                            data_temp[
-                                "canonical_isomeric_explicit_hydrogen_mapped_smiles"
-                            ]
-                        )
-                        data_temp["dataset_name"] = dataset_name
-                        self.data.append(data_temp)
+                        self.data.append(datapoint)
                     else:
-                        # if we have already encountered this molecule we need to append to the data
-                        # since we are using numpy we will use vstack to append to the arrays
+                        # the molecule was already read from a previous file,
+                        # so we append the conformers to the existing record
                         index = self.molecule_names[name]
-
-                        self.data[index]["n_configs"] += 1
-                        self.data[index]["geometry"] = np.vstack(
-                            (
-                                self.data[index]["geometry"],
-                                val["molecule"]["geometry"].reshape(1, -1, 3),
+                        for quantity_o in _CONFORMER_QUANTITIES:
+                            self.data[index][quantity_o] = np.concatenate(
+                                (self.data[index][quantity_o], datapoint[quantity_o])
                             )
-                        )
+                        self.data[index]["n_configs"] += datapoint["n_configs"]
 
-            with SqliteDict(
-                input_file_name, tablename="spec_2", autocommit=False
-            ) as spice_db:
-                logger.debug(f"Processing {filename} spec_2.")
+        # the input units of each quantity that is stored in self.data
+        u_in = {key: val["u_in"] for key, val in self.qm_parameters.items()}
 
-                for key in tqdm(sorted_keys):
-                    name = key.split("-")[0]
-                    val = spice_db[original_name[key]]
-
-                    index = self.molecule_names[name]
-
-                    # note, we will use the convention of names being lowercase
-                    # and spaces denoted by underscore
-                    quantity = "dft total energy"
-                    quantity_o = "dft_total_energy"
-                    if quantity_o not in self.data[index].keys():
-                        self.data[index][quantity_o] = val["properties"][quantity]
-                    else:
-                        self.data[index][quantity_o] = np.vstack(
-                            (self.data[index][quantity_o], val["properties"][quantity])
-                        )
-
-                    quantity = "dft total gradient"
-                    quantity_o = "dft_total_gradient"
-                    if quantity_o not in self.data[index].keys():
-                        self.data[index][quantity_o] = np.array(
-                            val["properties"][quantity]
-                        ).reshape(1, -1, 3)
-                    else:
-                        self.data[index][quantity_o] = np.vstack(
-                            (
-                                self.data[index][quantity_o],
-                                np.array(val["properties"][quantity]).reshape(1, -1, 3),
-                            )
-                        )
-
-                    quantity = "mbis charges"
-                    quantity_o = "mbis_charges"
-                    if quantity_o not in self.data[index].keys():
-                        self.data[index][quantity_o] = np.array(
-                            val["properties"][quantity]
-                        ).reshape(1, -1)[..., newaxis]
-
-                    else:
-                        self.data[index][quantity_o] = np.vstack(
-                            (
-                                self.data[index][quantity_o],
-                                np.array(val["properties"][quantity]).reshape(1, -1)[
-                                    ..., newaxis
-                                ],
-                            )
-                        )
-
-                    quantity = "scf dipole"
-                    quantity_o = "scf_dipole"
-                    if quantity_o not in self.data[index].keys():
-                        self.data[index][quantity_o] = np.array(
-                            val["properties"][quantity]
-                        ).reshape(1, 3)
-                    else:
-                        self.data[index][quantity_o] = np.vstack(
-                            (
-                                self.data[index][quantity_o],
-                                np.array(val["properties"][quantity]).reshape(1, 3),
-                            )
-                        )
-
-            with SqliteDict(
-                input_file_name, tablename="spec_6", autocommit=False
-            ) as spice_db:
-                logger.debug(f"Processing {filename} spec_6.")
-
-                for key in tqdm(sorted_keys):
-                    name = key.split("-")[0]
-                    val = spice_db[original_name[key]]
-                    index = self.molecule_names[name]
-
-                    # typecasting issue in there
-
-                    quantity = "dispersion correction energy"
-                    quantity_o = "dispersion_correction_energy"
-                    # Note need to typecast here because of a bug in the
-                    # qcarchive entry: see issue: https://github.com/MolSSI/QCFractal/issues/766
-                    if quantity_o not in self.data[index].keys():
-                        self.data[index][quantity_o] = np.array(
-                            float(val["properties"][quantity])
-                        ).reshape(1, 1)
-                    else:
-                        self.data[index][quantity_o] = np.vstack(
-                            (
-                                self.data[index][quantity_o],
-                                np.array(float(val["properties"][quantity])).reshape(
-                                    1, 1
-                                ),
-                            ),
-                        )
-                    quantity = "dispersion correction gradient"
-                    quantity_o = "dispersion_correction_gradient"
-                    if quantity_o not in self.data[index].keys():
-                        self.data[index][quantity_o] = np.array(
-                            val["properties"][quantity]
-                        ).reshape(1, -1, 3)
-                    else:
-                        self.data[index][quantity_o] = np.vstack(
-                            (
-                                self.data[index][quantity_o],
-                                np.array(val["properties"][quantity]).reshape(1, -1, 3),
-                            )
-                        )
-        # assign units
         for datapoint in self.data:
-            for key in datapoint.keys():
-                if key in self.qm_parameters:
-                    if not isinstance(datapoint[key], unit.Quantity):
-                        datapoint[key] = (
-                            datapoint[key] * self.qm_parameters[key]["u_in"]
-                        )
-            # add in the formation energy defined as:
-            # dft_total_energy + dispersion_correction_energy - reference_energy
-
-            # the dispersion corrected energy and gradient can be calculated from the raw data
-            datapoint["dft_total_energy"] = (
-                datapoint["dft_total_energy"]
-                + datapoint["dispersion_correction_energy"]
+            # the dispersion corrected energy and gradient can be calculated from the raw data;
+            # all energies and gradients are in the same input units (hartree and hartree/bohr)
+            # so we can combine them before units are attached.
+            # we only want to write the dispersion corrected values to the file to avoid confusion
+            datapoint["dft_total_energy"] += datapoint.pop(
+                "dispersion_correction_energy"
             )
-            # we only want to write the dispersion corrected energy to the file to avoid confusion
-            datapoint.pop("dispersion_correction_energy")
-
-            datapoint["dft_total_gradient"] = (
-                datapoint["dft_total_gradient"]
-                + datapoint["dispersion_correction_gradient"]
+            datapoint["dft_total_gradient"] += datapoint.pop(
+                "dispersion_correction_gradient"
             )
             datapoint["dft_total_force"] = -datapoint["dft_total_gradient"]
-            # we only want to write the dispersion corrected gradient to the file to avoid confusion
-            datapoint.pop("dispersion_correction_gradient")
 
+            # add in the formation energy defined as:
+            # dft_total_energy + dispersion_correction_energy - reference_energy
+            # the reference energy is the same for every conformer of the molecule
             datapoint["formation_energy"] = (
-                datapoint["dft_total_energy"]
-                - np.array(datapoint["reference_energy"].m * datapoint["n_configs"])
-                * datapoint["reference_energy"].u
+                datapoint["dft_total_energy"] - datapoint["reference_energy"]
             )
 
+            # assign units
+            for key in datapoint.keys():
+                if key in u_in:
+                    datapoint[key] = datapoint[key] * u_in[key]
+
         if self.convert_units:
             self._convert_units()
 
@@ -745,6 +1075,7 @@ class SPICE1OpenFFCuration(DatasetCuration):
         total_conformers: Optional[int] = None,
         limit_atomic_species: Optional[list] = None,
         n_threads=6,
+        n_workers: Optional[int] = 1,
     ) -> None:
         """
         Downloads the dataset, extracts relevant information, and writes an hdf5 file.
@@ -769,6 +1100,10 @@ class SPICE1OpenFFCuration(DatasetCuration):
             If set to a list of element symbols, records that contain any elements not in this list will be ignored.
         n_threads, int, default=6
             Number of concurrent threads for retrieving data from QCArchive
+        n_workers: Optional[int], optional, default=1
+            Number of processes used to process the downloaded sqlite files; if 1, the files are processed
+            in the calling process. If None, the number of CPUs is used. With more than one worker,
+            scripts must guard their entry point with `if __name__ == "__main__":` on macOS and Windows.
         Examples
         --------
         >>> spice_1_openff_data = SPICE1OpenFFCuration(hdf5_file_name='spice_1_openff_dataset.hdf5',
@@ -853,6 +1188,7 @@ class SPICE1OpenFFCuration(DatasetCuration):
             max_conformers_per_record=max_conformers_per_record,
             total_conformers=total_conformers,
             atomic_numbers_to_limit=self.atomic_numbers_to_limit,
+            n_workers=n_workers,
         )
 
         self._generate_hdf5()
@@ -767,10 +767,9 @@ class SPICE2Curation(DatasetCuration):
             # we only want to write the dispersion corrected gradient to the file to avoid confusion
             datapoint.pop("dispersion_correction_gradient")
 
+            # the reference energy is the same for every conformer of the molecule
             datapoint["formation_energy"] = (
-                datapoint["dft_total_energy"]
-                - np.array(datapoint["reference_energy"].m * datapoint["n_configs"])
-                * datapoint["reference_energy"].u
+                datapoint["dft_total_energy"] - datapoint["reference_energy"]
             )
 
         if self.convert_units:
@@ -98,6 +98,16 @@ class Metadata:
             self.F = self.F.to(dtype)
         return self
 
+    def pin_memory(self):
+        """Copy all tensors in this instance to page-locked memory."""
+        self.E = self.E.pin_memory()
+        self.F = self.F.pin_memory()
+        self.atomic_subsystem_counts = self.atomic_subsystem_counts.pin_memory()
+        self.atomic_subsystem_indices_referencing_dataset = (
+            self.atomic_subsystem_indices_referencing_dataset.pin_memory()
+        )
+        return self
+
 
 @dataclass
 class NNPInput:
@@ -154,6 +164,34 @@ class NNPInput:
             self.positions = self.positions.to(dtype)
         return self
 
+    def pin_memory(self):
+        """
+        Copy all tensors in this instance to page-locked memory.
+
+        This is called by the DataLoader when pin_memory=True, which only pins custom batch
+        types that define this method; pinned tensors can be copied to the GPU asynchronously.
+        """
+        self.atomic_numbers = self.atomic_numbers.pin_memory()
+        # pin a detached copy, so that the positions remain a leaf tensor
+        self.positions = (
+            self.positions.detach()
+            .pin_memory()
+            .requires_grad_(self.positions.requires_grad)
+        )
+        self.atomic_subsystem_indices = self.atomic_subsystem_indices.pin_memory()
+        self.total_charge = self.total_charge.pin_memory()
+        self.pair_list = (
+            self.pair_list.pin_memory()
+            if self.pair_list is not None
+            else self.pair_list
+        )
+        self.partial_charge = (
+            self.partial_charge.pin_memory()
+            if self.partial_charge is not None
+            else self.partial_charge
+        )
+        return self
+
     def __post_init__(self):
         # Set dtype and convert units if necessary
         self.atomic_numbers = self.atomic_numbers.to(torch.int32)
@@ -239,6 +277,17 @@ class BatchData:
         self.metadata = self.metadata.to(device=device, dtype=dtype)
         return self
 
+    def pin_memory(self):
+        """
+        Copy all tensors in this instance to page-locked memory.
+
+        This is called by the DataLoader when pin_memory=True; without it,
+        the DataLoader would return the batch unpinned.
+        """
+        self.nnp_input = self.nnp_input.pin_memory()
+        self.metadata = self.metadata.pin_memory()
+        return self
+
     def batch_size(self):
         return self.metadata.E.size(dim=0)
 
@@ -1135,6 +1184,9 @@ class DataModule(pl.LightningDataModule):
         self.regenerate_processed_cache = (
             regenerate_processed_cache or self.regenerate_cache
         )
+        # set once prepare_data has run, so that repeated calls on the same
+        # instance do not process the dataset again
+        self._data_prepared = False
 
         self.pairlist = Pairlist()
         self.dataset_statistic_filename = (
@@ -1156,6 +1208,10 @@ class DataModule(pl.LightningDataModule):
         """
         # check if there is a filelock present, if so, wait until it is removed
 
+        if self._data_prepared:
+            log.debug('Dataset already prepared. Skipping "prepare_data" step.')
+            return None
+
         # if the dataset has already been processed, skip this step
         if (
             os.path.exists(self.cache_processed_dataset_filename)
@@ -1166,6 +1222,7 @@ class DataModule(pl.LightningDataModule):
                     f"Dataset statistics file {self.dataset_statistic_filename} not found. Please regenerate the cache."
                 )
             log.info('Processed dataset already exists. Skipping "prepare_data" step.')
+            self._data_prepared = True
             return None
 
         # if the dataset is not already processed, process it
@@ -1232,6 +1289,7 @@ class DataModule(pl.LightningDataModule):
 
         # Save processed dataset and statistics for later use in setup
         self._cache_dataset(torch_dataset)
+        self._data_prepared = True
 
     def _log_dataset_statistic(self, dataset_statistic):
         """Save the dataset statistics to a file with units"""
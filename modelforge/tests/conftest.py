@@ -1,4 +1,6 @@
+import copy
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Dict, Optional
 
 import pytest
@@ -58,10 +60,18 @@ from modelforge.dataset.dataset import (
 def single_batch_with_batchsize():
     """
     Utility fixture to create a single batch of data for testing.
+
+    The first batch for each batch size and dataset is only loaded once per session;
+    each call returns a copy of it, so tests are free to modify it.
     """
+    batches = {}
 
     def _create_single_batch(batch_size: int, dataset_name: str):
-        return single_batch(batch_size=batch_size, dataset_name=dataset_name)
+        if (batch_size, dataset_name) not in batches:
+            batches[(batch_size, dataset_name)] = single_batch(
+                batch_size=batch_size, dataset_name=dataset_name
+            )
+        return copy.deepcopy(batches[(batch_size, dataset_name)])
 
     return _create_single_batch
 
@@ -183,9 +193,35 @@ def get_dataset_container_fix():
     return get_dataset_container
 
 
+@lru_cache(maxsize=None)
+def _load_default_configs(potential_name: str, dataset_name: str) -> dict:
+    from modelforge.utils.misc import load_configs_into_pydantic_models
+
+    return load_configs_into_pydantic_models(potential_name, dataset_name)
+
+
+def _copy_configs(configs: dict) -> dict:
+    # tests may modify the parameters, so each test receives its own copy
+    return {key: value.model_copy(deep=True) for key, value in configs.items()}
+
+
+# default configuration fixtures; the toml files are only parsed and validated once
+@pytest.fixture
+def painn_qm9_config():
+    return _copy_configs(_load_default_configs("painn", "qm9"))
+
+
+@pytest.fixture
+def physnet_qm9_config():
+    return _copy_configs(_load_default_configs("physnet", "qm9"))
+
+
 # Fixture for equivariance test utilities
 @pytest.fixture
 def equivariance_utils():
+    # the symmetry operations are only sampled once per session, but we still seed the
+    # global random number generator so that the rest of each test is deterministic
+    torch.manual_seed(12345)
     return equivariance_test_utils()
 
 
@@ -193,7 +229,23 @@ def equivariance_utils():
 # helper functions
 # ----------------------------------------------------------- #
 
-from modelforge.dataset.dataset import BatchData
+from modelforge.potential.utils import BatchData, Metadata, NNPInput
+
+# the methane geometry is only built once; the fixture returns copies
+_METHANE_ATOMIC_NUMBERS = torch.tensor([6, 1, 1, 1, 1], dtype=torch.int64)
+_METHANE_POSITIONS = (
+    torch.tensor(
+        [
+            [0.0, 0.0, 0.0],
+            [0.63918859, 0.63918859, 0.63918859],
+            [-0.63918859, -0.63918859, 0.63918859],
+            [-0.63918859, 0.63918859, -0.63918859],
+            [0.63918859, -0.63918859, -0.63918859],
+        ],
+    )
+    / 10  # NOTE: converting to nanometer
+)
+_METHANE_ATOMIC_SUBSYSTEM_INDICES = torch.tensor([0, 0, 0, 0, 0], dtype=torch.int32)
 
 
 @pytest.fixture
@@ -205,24 +257,10 @@ def methane() -> BatchData:
     -------
     BatchData
     """
-    from modelforge.potential.utils import BatchData, Metadata, NNPInput
-
-    atomic_numbers = torch.tensor([6, 1, 1, 1, 1], dtype=torch.int64)
-    positions = (
-        torch.tensor(
-            [
-                [0.0, 0.0, 0.0],
-                [0.63918859, 0.63918859, 0.63918859],
-                [-0.63918859, -0.63918859, 0.63918859],
-                [-0.63918859, 0.63918859, -0.63918859],
-                [0.63918859, -0.63918859, -0.63918859],
-            ],
-            requires_grad=True,
-        )
-        / 10  # NOTE: converting to nanometer
-    )
+    atomic_numbers = _METHANE_ATOMIC_NUMBERS.clone()
+    positions = _METHANE_POSITIONS.clone().requires_grad_(True)
     E = torch.tensor([0.0], requires_grad=True)
-    atomic_subsystem_indices = torch.tensor([0, 0, 0, 0, 0], dtype=torch.int32)
+    atomic_subsystem_indices = _METHANE_ATOMIC_SUBSYSTEM_INDICES.clone()
     return BatchData(
         NNPInput(
             atomic_numbers=atomic_numbers,
@@ -241,132 +279,14 @@ def methane() -> BatchData:
 
 import math
 
-import torch
-
-
-def generate_uniform_quaternion(u=None):
-    """
-    Generates a uniform normalized quaternion.
-
-    Adapted from numpy implementation in openmm-tools
-    https://github.com/choderalab/openmmtools/blob/main/openmmtools/mcmc.py
-
-    Parameters
-    ----------
-    u : torch.Tensor
-        Tensor of shape (3,). Optional, default is None.
-        If not provided, a random tensor is generated.
-
-    References
-    ----------
-    [1] K. Shoemake. Uniform random rotations. In D. Kirk, editor,
-    Graphics Gems III, pages 124-132. Academic, New York, 1992.
-    [2] Described briefly here: http://planning.cs.uiuc.edu/node198.html
-    """
-    import torch
-
-    if u is None:
-        u = torch.rand(3)
-    # import numpy for pi
-    import numpy as np
-
-    q = torch.tensor(
-        [
-            torch.sqrt(1 - u[0]) * torch.sin(2 * np.pi * u[1]),
-            torch.sqrt(1 - u[0]) * torch.cos(2 * np.pi * u[1]),
-            torch.sqrt(u[0]) * torch.sin(2 * np.pi * u[2]),
-            torch.sqrt(u[0]) * torch.cos(2 * np.pi * u[2]),
-        ]
-    )
-    return q
-
-
-def rotation_matrix_from_quaternion(quaternion):
-    """Compute a 3x3 rotation matrix from a given quaternion (4-vector).
-
-    Adapted from the numpy implementation in openmm-tools
-
-    https://github.com/choderalab/openmmtools/blob/main/openmmtools/mcmc.py
-
-    Parameters
-    ----------
-    q : torch.Tensor
-        Quaternion tensor of shape (4,).
-
-    Returns
-    -------
-    torch.Tensor
-        Rotation matrix tensor of shape (3, 3).
-
-    References
-    ----------
-    [1] http://en.wikipedia.org/wiki/Rotation_matrix#Quaternion
-    """
-
-    w, x, y, z = quaternion.unbind()
-    Nq = (quaternion**2).sum()  # Squared norm.
-    if Nq > 0.0:
-        s = 2.0 / Nq
-    else:
-        s = 0.0
-
-    X = x * s
-    Y = y * s
-    Z = z * s
-    wX = w * X
-    wY = w * Y
-    wZ = w * Z
-    xX = x * X
-    xY = x * Y
-    xZ = x * Z
-    yY = y * Y
-    yZ = y * Z
-    zZ = z * Z
-
-    rotation_matrix = torch.tensor(
-        [
-            [1.0 - (yY + zZ), xY - wZ, xZ + wY],
-            [xY + wZ, 1.0 - (xX + zZ), yZ - wX],
-            [xZ - wY, yZ + wX, 1.0 - (xX + yY)],
-        ],
-        dtype=torch.float64,
-    )
-    return rotation_matrix
-
-
-def apply_rotation_matrix(coordinates, rotation_matrix, use_center_of_mass=True):
-    """
-    Rotate the coordinates using the rotation matrix.
-
-    Parameters
-    ----------
-    coordinates : torch.Tensor
-        The coordinates to rotate.
-    rotation_matrix : torch.Tensor
-        The rotation matrix.
-    use_center_of_mass : bool
-        If True, the coordinates are rotated around the center of mass, not the origin.
-
-    Returns
-    -------
-    torch.Tensor
-        The rotated coordinates.
-    """
-
-    if use_center_of_mass:
-        coordinates_com = torch.mean(coordinates, 0)
-    else:
-        coordinates_com = torch.zeros(3)
-
-    coordinates_proposed = (
-        torch.matmul(
-            rotation_matrix, (coordinates - coordinates_com).transpose(0, -1)
-        ).transpose(0, -1)
-    ) + coordinates_com
-
-    return coordinates_proposed
+from modelforge.tests.helper_functions import (
+    apply_rotation_matrix,
+    generate_uniform_quaternion,
+    rotation_matrix_from_quaternion,
+)
 
 
+@lru_cache(maxsize=None)
 def equivariance_test_utils():
     """
     Generates random tensors for testing equivariance of a neural network.
@@ -387,28 +307,29 @@ def equivariance_test_utils():
     # if the code is correctly implemented, there may be instances where the tolerance we set is not
     # sufficient to pass the test, and without the workflow being deterministic, it may be hard to
     # debug if it is an underlying issue with the code or just the tolerance.
+    # The operations do not depend on any input, so they are only generated once (see lru_cache);
+    # the state of the global random number generator is restored afterwards.
+
+    # the operations are sampled on the CPU, so only the CPU generator is forked and seeded
+    with torch.random.fork_rng(devices=[]):
+        torch.random.default_generator.manual_seed(12345)
+        x_translation = torch.randn(
+            size=(1, 3),
+        )
 
-    torch.manual_seed(12345)
-    x_translation = torch.randn(
-        size=(1, 3),
-    )
-    translation = lambda x: x + x_translation
-
-    # generate random quaternion and rotation matrix
-    q = generate_uniform_quaternion()
-    rotation_matrix = rotation_matrix_from_quaternion(q)
-
-    rotation = lambda x: apply_rotation_matrix(x, rotation_matrix)
+        # generate random quaternion and rotation matrix
+        q = generate_uniform_quaternion()
+        rotation_matrix = rotation_matrix_from_quaternion(q)
 
-    # Define reflection function
-    alpha = torch.distributions.Uniform(-math.pi, math.pi).sample()
-    beta = torch.distributions.Uniform(-math.pi, math.pi).sample()
-    gamma = torch.distributions.Uniform(-math.pi, math.pi).sample()
-    v = torch.tensor([[alpha, beta, gamma]], dtype=torch.float64)
-    v /= (v**2).sum() ** 0.5
+        # Define reflection function
+        v = torch.empty(1, 3).uniform_(-math.pi, math.pi).to(torch.float64)
+    v /= v.norm()
 
     p = torch.eye(3) - 2 * v.T @ v
 
+    translation = lambda x: x + x_translation
+    rotation = lambda x: apply_rotation_matrix(x, rotation_matrix)
+
     reflection = lambda x: x @ p
 
     return translation, rotation, reflection
@@ -0,0 +1,136 @@
+import math
+
+import torch
+
+
+def generate_uniform_quaternion(u=None):
+    """
+    Generates a uniform normalized quaternion.
+
+    Adapted from numpy implementation in openmm-tools
+    https://github.com/choderalab/openmmtools/blob/main/openmmtools/mcmc.py
+
+    Parameters
+    ----------
+    u : torch.Tensor
+        Tensor of shape (3,). Optional, default is None.
+        If not provided, a random tensor is generated.
+
+    References
+    ----------
+    [1] K. Shoemake. Uniform random rotations. In D. Kirk, editor,
+    Graphics Gems III, pages 124-132. Academic, New York, 1992.
+    [2] Described briefly here: http://planning.cs.uiuc.edu/node198.html
+    """
+    if u is None:
+        u = torch.rand(3)
+
+    r0 = torch.sqrt(1 - u[0])
+    r1 = torch.sqrt(u[0])
+    a = 2 * math.pi * u[1]
+    b = 2 * math.pi * u[2]
+
+    q = torch.stack(
+        [
+            r0 * torch.sin(a),
+            r0 * torch.cos(a),
+            r1 * torch.sin(b),
+            r1 * torch.cos(b),
+        ]
+    )
+    return q
+
+
+def rotation_matrix_from_quaternion(quaternion):
+    """Compute a 3x3 rotation matrix from a given quaternion (4-vector).
+
+    Adapted from the numpy implementation in openmm-tools
+
+    https://github.com/choderalab/openmmtools/blob/main/openmmtools/mcmc.py
+
+    Parameters
+    ----------
+    q : torch.Tensor
+        Quaternion tensor of shape (4,).
+
+    Returns
+    -------
+    torch.Tensor
+        Rotation matrix tensor of shape (3, 3).
+
+    References
+    ----------
+    [1] http://en.wikipedia.org/wiki/Rotation_matrix#Quaternion
+    """
+
+    w, x, y, z = quaternion.unbind()
+    Nq = (quaternion**2).sum()  # Squared norm.
+    # clamp the norm so that the unselected branch stays finite, which keeps the
+    # gradient of a zero quaternion finite as well
+    s = torch.where(Nq > 0.0, 2.0 / Nq.clamp_min(1e-30), torch.zeros_like(Nq))
+
+    X = x * s
+    Y = y * s
+    Z = z * s
+    wX = w * X
+    wY = w * Y
+    wZ = w * Z
+    xX = x * X
+    xY = x * Y
+    xZ = x * Z
+    yY = y * Y
+    yZ = y * Z
+    zZ = z * Z
+
+    # build the matrix from the tensor entries, rather than from python scalars,
+    # so that it stays on the device of the quaternion and remains part of the graph
+    rotation_matrix = (
+        torch.stack(
+            [
+                1.0 - (yY + zZ),
+                xY - wZ,
+                xZ + wY,
+                xY + wZ,
+                1.0 - (xX + zZ),
+                yZ - wX,
+                xZ - wY,
+                yZ + wX,
+                1.0 - (xX + yY),
+            ]
+        )
+        .view(3, 3)
+        .to(torch.float64)
+    )
+    return rotation_matrix
+
+
+def apply_rotation_matrix(coordinates, rotation_matrix, use_center_of_mass=True):
+    """
+    Rotate the coordinates using the rotation matrix.
+
+    Parameters
+    ----------
+    coordinates : torch.Tensor
+        The coordinates to rotate.
+    rotation_matrix : torch.Tensor
+        The rotation matrix.
+    use_center_of_mass : bool
+        If True, the coordinates are rotated around the center of mass, not the origin.
+
+    Returns
+    -------
+    torch.Tensor
+        The rotated coordinates.
+    """
+
+    if use_center_of_mass:
+        coordinates_com = torch.mean(coordinates, 0)
+    else:
+        coordinates_com = coordinates.new_zeros(3)
+
+    coordinates_proposed = (
+        torch.einsum("ij,nj->ni", rotation_matrix, coordinates - coordinates_com)
+        + coordinates_com
+    )
+
+    return coordinates_proposed
@@ -1,11 +1,23 @@
+from functools import lru_cache
+
 import torch
 
 
-def setup_single_methane_input():
-    import torch
+@lru_cache(maxsize=None)
+def _all_pairs(n_atoms: int):
+    """Return the (idx_i, idx_j) neighbor list of all pairs i != j of n_atoms atoms."""
+    idx_i = torch.arange(n_atoms).repeat_interleave(n_atoms - 1)
+    idx_j = torch.arange(n_atoms).expand(n_atoms, n_atoms)[
+        ~torch.eye(n_atoms, dtype=torch.bool)
+    ]
+    return idx_i, idx_j
 
+
+@lru_cache(maxsize=1)
+def _methane_reference_base():
     # ------------------------------------ #
-    # set up the input for the spk Painn model
+    # set up the input for the spk Painn model; the precalculated results
+    # share these entries and only add the model specific representations
     methan_spk = {
         "_idx": torch.tensor([0]),
         "dipole_moment": torch.tensor([0.0], dtype=torch.float64),
@@ -23,41 +35,11 @@ def setup_single_methane_input():
             ],
             dtype=torch.float64,
         ),
-        "_cell": torch.tensor(
-            [[[0.0, 0.0, 0.0], [0.0, 0.0, 0.0], [0.0, 0.0, 0.0]]], dtype=torch.float64
-        ),
+        "_cell": torch.zeros((1, 3, 3), dtype=torch.float64),
         "_pbc": torch.tensor([False, False, False]),
-        "_offsets": torch.tensor(
-            [
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-            ],
-            dtype=torch.float64,
-        ),
-        "_idx_i": torch.tensor(
-            [0, 0, 0, 0, 1, 1, 1, 1, 2, 2, 2, 2, 3, 3, 3, 3, 4, 4, 4, 4]
-        ),
-        "_idx_j": torch.tensor(
-            [1, 2, 3, 4, 0, 2, 3, 4, 0, 1, 3, 4, 0, 1, 2, 4, 0, 1, 2, 3]
-        ),
+        "_offsets": torch.zeros((20, 3), dtype=torch.float64),
+        "_idx_i": _all_pairs(5)[0],
+        "_idx_j": _all_pairs(5)[1],
         "_Rij": torch.tensor(
             [
                 [1.4849e-02, -1.0918e00, -6.0249e-03],
@@ -85,25 +67,23 @@ def setup_single_methane_input():
         ),
     }
     # ------------------------------------ #
+    return methan_spk
+
+
+def _clone_tensors(values: dict) -> dict:
+    """Return a copy of a dictionary of cached tensors that the caller may modify."""
+    return {key: value.clone() for key, value in values.items()}
+
+
+def setup_single_methane_input():
+    # the tensors are only built once; each call returns copies, as the models may modify their inputs
+    methan_spk = _clone_tensors(_methane_reference_base())
 
     # ------------------------------------ #
     # set up the input for the modelforge Painn model
     atomic_numbers = torch.tensor([6, 1, 1, 1, 1], dtype=torch.int64)
 
-    positions = (
-        torch.tensor(
-            [
-                [-1.2698e-02, 1.0858e00, 8.0010e-03],
-                [2.1504e-03, -6.0313e-03, 1.9761e-03],
-                [1.0117e00, 1.4638e00, 2.7657e-04],
-                [-5.4082e-01, 1.4475e00, -8.7664e-01],
-                [-5.2381e-01, 1.4379e00, 9.0640e-01],
-            ],
-            dtype=torch.float64,
-            requires_grad=True,
-        )
-        / 10
-    )
+    positions = methan_spk["_positions"].clone().requires_grad_(True) / 10
     E = torch.tensor([0.0], requires_grad=True)
     atomic_subsystem_indices = torch.tensor([0, 0, 0, 0, 0], dtype=torch.int32)
     from modelforge.dataset.dataset import NNPInput
@@ -122,84 +102,12 @@ def setup_single_methane_input():
     }
 
 
-def load_precalculated_painn_results():
+@lru_cache(maxsize=1)
+def _precalculated_painn_results():
     results = {
-        "_idx": torch.tensor([0]),
+        **_methane_reference_base(),
+        # the painn reference was generated with a single precision dipole moment
         "dipole_moment": torch.tensor([0.0]),
-        "energy_U0": torch.tensor([-40.4789], dtype=torch.float64),
-        "energy_U": torch.tensor([-40.4761], dtype=torch.float64),
-        "_n_atoms": torch.tensor([5]),
-        "_atomic_numbers": torch.tensor([6, 1, 1, 1, 1]),
-        "_positions": torch.tensor(
-            [
-                [-1.2698e-02, 1.0858e00, 8.0010e-03],
-                [2.1504e-03, -6.0313e-03, 1.9761e-03],
-                [1.0117e00, 1.4638e00, 2.7657e-04],
-                [-5.4082e-01, 1.4475e00, -8.7664e-01],
-                [-5.2381e-01, 1.4379e00, 9.0640e-01],
-            ],
-            dtype=torch.float64,
-        ),
-        "_cell": torch.tensor(
-            [[[0.0, 0.0, 0.0], [0.0, 0.0, 0.0], [0.0, 0.0, 0.0]]], dtype=torch.float64
-        ),
-        "_pbc": torch.tensor([False, False, False]),
-        "_offsets": torch.tensor(
-            [
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-            ],
-            dtype=torch.float64,
-        ),
-        "_idx_i": torch.tensor(
-            [0, 0, 0, 0, 1, 1, 1, 1, 2, 2, 2, 2, 3, 3, 3, 3, 4, 4, 4, 4]
-        ),
-        "_idx_j": torch.tensor(
-            [1, 2, 3, 4, 0, 2, 3, 4, 0, 1, 3, 4, 0, 1, 2, 4, 0, 1, 2, 3]
-        ),
-        "_Rij": torch.tensor(
-            [
-                [1.4849e-02, -1.0918e00, -6.0249e-03],
-                [1.0244e00, 3.7795e-01, -7.7244e-03],
-                [-5.2812e-01, 3.6172e-01, -8.8464e-01],
-                [-5.1112e-01, 3.5213e-01, 8.9840e-01],
-                [-1.4849e-02, 1.0918e00, 6.0249e-03],
-                [1.0096e00, 1.4698e00, -1.6995e-03],
-                [-5.4297e-01, 1.4536e00, -8.7862e-01],
-                [-5.2596e-01, 1.4440e00, 9.0442e-01],
-                [-1.0244e00, -3.7795e-01, 7.7244e-03],
-                [-1.0096e00, -1.4698e00, 1.6995e-03],
-                [-1.5525e00, -1.6225e-02, -8.7692e-01],
-                [-1.5355e00, -2.5819e-02, 9.0612e-01],
-                [5.2812e-01, -3.6172e-01, 8.8464e-01],
-                [5.4297e-01, -1.4536e00, 8.7862e-01],
-                [1.5525e00, 1.6225e-02, 8.7692e-01],
-                [1.7001e-02, -9.5940e-03, 1.7830e00],
-                [5.1112e-01, -3.5213e-01, -8.9840e-01],
-                [5.2596e-01, -1.4440e00, -9.0442e-01],
-                [1.5355e00, 2.5819e-02, -9.0612e-01],
-                [-1.7001e-02, 9.5940e-03, -1.7830e00],
-            ],
-            dtype=torch.float64,
-        ),
         "scalar_representation": torch.tensor(
             [
                 [0.1628, 0.9060, -1.7949, -2.2348, -1.5576, 0.0653, -1.8837, 0.0704],
@@ -380,84 +288,15 @@ def load_precalculated_painn_results():
     return results
 
 
-def load_precalculated_schnet_results():
+def load_precalculated_painn_results():
+    # the tensors are only built once; each call returns copies that the caller may modify
+    return _clone_tensors(_precalculated_painn_results())
+
+
+@lru_cache(maxsize=1)
+def _precalculated_schnet_results():
     schnetpack_results = {
-        "_idx": torch.tensor([0]),
-        "dipole_moment": torch.tensor([0.0], dtype=torch.float64),
-        "energy_U0": torch.tensor([-40.4789], dtype=torch.float64),
-        "energy_U": torch.tensor([-40.4761], dtype=torch.float64),
-        "_n_atoms": torch.tensor([5]),
-        "_atomic_numbers": torch.tensor([6, 1, 1, 1, 1]),
-        "_positions": torch.tensor(
-            [
-                [-1.2698e-02, 1.0858e00, 8.0010e-03],
-                [2.1504e-03, -6.0313e-03, 1.9761e-03],
-                [1.0117e00, 1.4638e00, 2.7657e-04],
-                [-5.4082e-01, 1.4475e00, -8.7664e-01],
-                [-5.2381e-01, 1.4379e00, 9.0640e-01],
-            ],
-            dtype=torch.float64,
-        ),
-        "_cell": torch.tensor(
-            [[[0.0, 0.0, 0.0], [0.0, 0.0, 0.0], [0.0, 0.0, 0.0]]], dtype=torch.float64
-        ),
-        "_pbc": torch.tensor([False, False, False]),
-        "_offsets": torch.tensor(
-            [
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-                [0.0, 0.0, 0.0],
-            ],
-            dtype=torch.float64,
-        ),
-        "_idx_i": torch.tensor(
-            [0, 0, 0, 0, 1, 1, 1, 1, 2, 2, 2, 2, 3, 3, 3, 3, 4, 4, 4, 4]
-        ),
-        "_idx_j": torch.tensor(
-            [1, 2, 3, 4, 0, 2, 3, 4, 0, 1, 3, 4, 0, 1, 2, 4, 0, 1, 2, 3]
-        ),
-        "_Rij": torch.tensor(
-            [
-                [1.4849e-02, -1.0918e00, -6.0249e-03],
-                [1.0244e00, 3.7795e-01, -7.7244e-03],
-                [-5.2812e-01, 3.6172e-01, -8.8464e-01],
-                [-5.1112e-01, 3.5213e-01, 8.9840e-01],
-                [-1.4849e-02, 1.0918e00, 6.0249e-03],
-                [1.0096e00, 1.4698e00, -1.6995e-03],
-                [-5.4297e-01, 1.4536e00, -8.7862e-01],
-                [-5.2596e-01, 1.4440e00, 9.0442e-01],
-                [-1.0244e00, -3.7795e-01, 7.7244e-03],
-                [-1.0096e00, -1.4698e00, 1.6995e-03],
-                [-1.5525e00, -1.6225e-02, -8.7692e-01],
-                [-1.5355e00, -2.5819e-02, 9.0612e-01],
-                [5.2812e-01, -3.6172e-01, 8.8464e-01],
-                [5.4297e-01, -1.4536e00, 8.7862e-01],
-                [1.5525e00, 1.6225e-02, 8.7692e-01],
-                [1.7001e-02, -9.5940e-03, 1.7830e00],
-                [5.1112e-01, -3.5213e-01, -8.9840e-01],
-                [5.2596e-01, -1.4440e00, -9.0442e-01],
-                [1.5355e00, 2.5819e-02, -9.0612e-01],
-                [-1.7001e-02, 9.5940e-03, -1.7830e00],
-            ],
-            dtype=torch.float64,
-        ),
+        **_methane_reference_base(),
         "scalar_representation": torch.tensor(
             [
                 [
@@ -537,6 +376,11 @@ def load_precalculated_schnet_results():
     return schnetpack_results
 
 
+def load_precalculated_schnet_results():
+    # the tensors are only built once; each call returns copies that the caller may modify
+    return _clone_tensors(_precalculated_schnet_results())
+
+
 def provide_reference_values_for_test_ani_test_compare_rsf():
     def calculate_reference():
         from torchani.aev import radial_terms
@@ -1912,6 +1912,283 @@ def test_spice_1_openff_process_datasets(prep_temp_dir):
     )
 
 
+class _FakeEntry(dict):
+    # stands in for the QCArchive entry objects that are stored in the sqlite files
+    def dict(self):
+        return {**self}
+
+
+def _write_fake_spice_sqlite(file_name, molecules, entry_type=dict):
+    """
+    Write a sqlite file with the entry, spec_2 and spec_6 tables of a downloaded SPICE dataset.
+
+    molecules is a list of (name, smiles, symbols, n_configs, errored_conformers);
+    the properties of each conformer are filled with random values.
+    Returns the rows of each table, keyed by the record name.
+    """
+    from types import SimpleNamespace
+    from sqlitedict import SqliteDict
+
+    rng = np.random.default_rng(len(molecules))
+    tables = {"entry": {}, "spec_2": {}, "spec_6": {}}
+    for name, smiles, symbols, n_configs, errored in molecules:
+        n_atoms = len(symbols)
+        for conformer in range(n_configs):
+            key = f"{name}-{conformer}"
+            tables["entry"][key] = entry_type(
+                {
+                    "name": key,
+                    "molecule": {
+                        "symbols": symbols,
+                        "geometry": rng.normal(size=(n_atoms, 3)),
+                        "identifiers": {"molecular_formula": name},
+                        "extras": {
+                            "canonical_isomeric_explicit_hydrogen_mapped_smiles": smiles
+                        },
+                    },
+                }
+            )
+            dispersion = {
+                "dispersion correction energy": float(rng.normal()),
+                "dispersion correction gradient": list(rng.normal(size=3 * n_atoms)),
+            }
+            status = "error" if conformer in errored else "complete"
+            tables["spec_2"][key] = {
+                "status": SimpleNamespace(value=status),
+                "properties": {
+                    "dft total energy": float(rng.normal()) - 40.0,
+                    "dft total gradient": list(rng.normal(size=3 * n_atoms)),
+                    "mbis charges": list(rng.normal(size=n_atoms)),
+                    "scf dipole": list(rng.normal(size=3)),
+                    **dispersion,
+                },
+            }
+            tables["spec_6"][key] = {
+                "status": SimpleNamespace(value="complete"),
+                "properties": dispersion,
+            }
+
+    for tablename, rows in tables.items():
+        with SqliteDict(file_name, tablename=tablename, autocommit=False) as db:
+            for key, value in rows.items():
+                db[key] = value
+            db.commit()
+
+    return tables
+
+
+def test_spice1_openff_formation_energy(prep_temp_dir):
+    # the formation energy of each conformer is its own dft total energy
+    # (including the dispersion correction) minus the reference energy of the molecule
+    local_path_dir = str(prep_temp_dir)
+    local_database_name = "test_formation_energy.sqlite"
+
+    _write_fake_spice_sqlite(
+        f"{local_path_dir}/{local_database_name}",
+        [
+            (
+                "methane",
+                "[C:1]([H:2])([H:3])([H:4])[H:5]",
+                ["C", "H", "H", "H", "H"],
+                4,
+                {},
+            ),
+            ("sodium", "[Na+:1]", ["Na"], 2, {}),
+        ],
+    )
+
+    spice_openff_data = SPICE1OpenFFCuration(
+        hdf5_file_name="test_formation_energy.hdf5",
+        output_file_dir=local_path_dir,
+        local_cache_dir=local_path_dir,
+        convert_units=False,
+    )
+    spice_openff_data._process_downloaded(
+        local_path_dir, [local_database_name], ["test"]
+    )
+
+    assert len(spice_openff_data.data) == 2
+    for datapoint in spice_openff_data.data:
+        reference_energy, _ = spice_openff_data._calculate_reference_energy_and_charge(
+            datapoint["canonical_isomeric_explicit_hydrogen_mapped_smiles"]
+        )
+        assert np.allclose(datapoint["reference_energy"], reference_energy)
+        assert datapoint["formation_energy"].shape == (datapoint["n_configs"], 1)
+        assert np.allclose(
+            datapoint["formation_energy"],
+            datapoint["dft_total_energy"] - reference_energy,
+        )
+        # the conformers have different energies, so a formation energy
+        # that is not computed per conformer would not match
+        assert len(np.unique(datapoint["formation_energy"].m)) == datapoint["n_configs"]
+
+
+def test_spice1_openff_sqlite_dict_values(prep_temp_dir):
+    from modelforge.curation.spice_1_openff_curation import (
+        _iterate_sqlite_dict_values,
+        _open_sqlite_dict,
+        _write_sqlite_dict_values,
+    )
+
+    file_name = f"{str(prep_temp_dir)}/test_sqlite_dict_values.sqlite"
+    items = {f"mol-{i}": {"index": i, "values": np.arange(i)} for i in range(10)}
+
+    _write_sqlite_dict_values(file_name, "spec_2", items.items(), batch_size=3)
+    # writing an existing key replaces the value
+    _write_sqlite_dict_values(file_name, "spec_2", [("mol-0", {"index": -1})])
+
+    with _open_sqlite_dict(file_name, tablename="spec_2") as db:
+        assert len(db) == 10
+        assert db["mol-0"] == {"index": -1}
+        assert np.all(db["mol-4"]["values"] == np.arange(4))
+
+        # values are returned in the order of the keys, across batches
+        keys = [f"mol-{i}" for i in [9, 2, 5, 1, 7]]
+        values = list(_iterate_sqlite_dict_values(db, keys, batch_size=2))
+        assert [key for key, _ in values] == keys
+        assert [value["index"] for _, value in values] == [9, 2, 5, 1, 7]
+
+        with pytest.raises(KeyError):
+            list(_iterate_sqlite_dict_values(db, ["mol-1", "mol-10"]))
+
+
+def test_spice1_openff_process_sqlite_file(prep_temp_dir):
+    file_name = f"{str(prep_temp_dir)}/test_process_sqlite_file.sqlite"
+
+    tables = _write_fake_spice_sqlite(
+        file_name,
+        [
+            # conformer 3 failed, so it is excluded
+            (
+                "methane",
+                "[C:1]([H:2])([H:3])([H:4])[H:5]",
+                ["C", "H", "H", "H", "H"],
+                12,
+                {3},
+            ),
+            (
+                "ALA-ALA",
+                "[N+:1]([H:2])([H:3])([H:4])[H:5]",
+                ["N", "H", "H", "H", "H"],
+                2,
+                {},
+            ),
+        ],
+    )
+
+    data = SPICE1OpenFFCuration._process_sqlite_file(file_name, "test")
+
+    assert [datapoint["name"] for datapoint in data] == ["ALA_ALA", "methane"]
+
+    methane = data[1]
+    assert methane["n_configs"] == 11
+    assert methane["dataset_name"] == "test"
+    assert np.all(methane["atomic_numbers"] == np.array([[6], [1], [1], [1], [1]]))
+    assert methane["total_charge"] == 0
+    assert np.isclose(methane["reference_energy"], -39.8676871)
+
+    # conformers are sorted numerically, i.e., methane-10 follows methane-9
+    keys = [f"methane-{i}" for i in range(12) if i != 3]
+    assert np.allclose(
+        methane["geometry"],
+        [tables["entry"][key]["molecule"]["geometry"] for key in keys],
+    )
+    assert np.allclose(
+        methane["dft_total_energy"].flatten(),
+        [tables["spec_2"][key]["properties"]["dft total energy"] for key in keys],
+    )
+    assert np.allclose(
+        methane["dispersion_correction_gradient"],
+        [
+            np.reshape(
+                tables["spec_6"][key]["properties"]["dispersion correction gradient"],
+                (-1, 3),
+            )
+            for key in keys
+        ],
+    )
+    assert methane["mbis_charges"].shape == (11, 5, 1)
+    assert methane["scf_dipole"].shape == (11, 3)
+
+    ala = data[0]
+    assert ala["n_configs"] == 2
+    assert ala["total_charge"] == 1
+
+
+@pytest.mark.parametrize("n_workers", [1, 2])
+def test_spice1_openff_process_downloaded_multiple_files(prep_temp_dir, n_workers):
+    local_path_dir = str(prep_temp_dir)
+    water = ("water", "[O:1]([H:2])[H:3]", ["O", "H", "H"])
+    methane = ("methane", "[C:1]([H:2])([H:3])([H:4])[H:5]", ["C", "H", "H", "H", "H"])
+
+    # water is found in both files, with a failed conformer in the second
+    tables_a = _write_fake_spice_sqlite(
+        f"{local_path_dir}/test_multiple_a.sqlite",
+        [(*water, 2, {}), (*methane, 3, {})],
+    )
+    tables_b = _write_fake_spice_sqlite(
+        f"{local_path_dir}/test_multiple_b.sqlite",
+        [(*water, 4, {1})],
+    )
+
+    spice_openff_data = SPICE1OpenFFCuration(
+        hdf5_file_name="test_multiple.hdf5",
+        output_file_dir=local_path_dir,
+        local_cache_dir=local_path_dir,
+        convert_units=False,
+    )
+    spice_openff_data._process_downloaded(
+        local_path_dir,
+        ["test_multiple_a.sqlite", "test_multiple_b.sqlite"],
+        ["A", "B"],
+        n_workers=n_workers,
+    )
+
+    assert [datapoint["name"] for datapoint in spice_openff_data.data] == [
+        "methane",
+        "water",
+    ]
+    water_data = spice_openff_data.data[1]
+    assert water_data["n_configs"] == 5
+
+    # the conformers of the second file are appended to those of the first
+    rows = [(tables_a, f"water-{i}") for i in range(2)] + [
+        (tables_b, f"water-{i}") for i in [0, 2, 3]
+    ]
+    assert np.allclose(
+        water_data["geometry"].m,
+        [tables["entry"][key]["molecule"]["geometry"] for tables, key in rows],
+    )
+    # the dispersion correction is included in the total energy and force
+    assert np.allclose(
+        water_data["dft_total_energy"].m.flatten(),
+        [
+            tables["spec_2"][key]["properties"]["dft total energy"]
+            + tables["spec_6"][key]["properties"]["dispersion correction energy"]
+            for tables, key in rows
+        ],
+    )
+    assert np.allclose(
+        water_data["dft_total_force"].m,
+        [
+            -np.reshape(
+                np.add(
+                    tables["spec_2"][key]["properties"]["dft total gradient"],
+                    tables["spec_6"][key]["properties"][
+                        "dispersion correction gradient"
+                    ],
+                ),
+                (-1, 3),
+            )
+            for tables, key in rows
+        ],
+    )
+    for quantity in ["mbis_charges", "scf_dipole", "formation_energy"]:
+        assert water_data[quantity].shape[0] == 5
+    assert "dispersion_correction_energy" not in water_data
+    assert "dispersion_correction_gradient" not in water_data
+
+
 def test_spice2_renaming(prep_temp_dir):
     local_path_dir = str(prep_temp_dir)
     hdf5_file_name = "test_spice2_dataset.hdf5"
@@ -2034,3 +2311,49 @@ def test_spice_2_process_datasets(prep_temp_dir):
         ]
     )
     assert np.allclose(spice_2_data.data[0]["dft_total_energy"].m, known_energies)
+
+
+def test_spice_2_formation_energy(prep_temp_dir):
+    # the formation energy of each conformer is its own dft total energy
+    # (including the dispersion correction) minus the reference energy of the molecule
+    local_path_dir = str(prep_temp_dir)
+    local_database_name = "test_spice2_formation_energy.sqlite"
+
+    _write_fake_spice_sqlite(
+        f"{local_path_dir}/{local_database_name}",
+        [
+            (
+                "methane",
+                "[C:1]([H:2])([H:3])([H:4])[H:5]",
+                ["C", "H", "H", "H", "H"],
+                3,
+                {},
+            )
+        ],
+        entry_type=_FakeEntry,
+    )
+
+    spice_2_data = SPICE2Curation(
+        hdf5_file_name="test_spice2_formation_energy.hdf5",
+        output_file_dir=local_path_dir,
+        local_cache_dir=local_path_dir,
+        convert_units=False,
+        release_version="2",
+    )
+    spice_2_data._process_downloaded(
+        local_path_dir,
+        [local_database_name],
+        [{"name": "test", "specifications": ["spec_2", "entry"]}],
+    )
+
+    datapoint = spice_2_data.data[0]
+    reference_energy, _ = spice_2_data._calculate_reference_energy_and_charge(
+        datapoint["canonical_isomeric_explicit_hydrogen_mapped_smiles"]
+    )
+    assert datapoint["n_configs"] == 3
+    assert datapoint["formation_energy"].shape == (3, 1)
+    assert np.allclose(
+        datapoint["formation_energy"],
+        datapoint["dft_total_energy"] - reference_energy,
+    )
+    assert len(np.unique(datapoint["formation_energy"].m)) == 3
@@ -940,3 +940,58 @@ def test_function_of_self_energy(dataset_name, datamodule_factory):
         )
         # compare this to the energy without postprocessing
         assert np.isclose(methane_energy_reference, methane_energy_offset + methane_ase)
+
+
+def test_pin_memory_of_collated_batch(monkeypatch):
+    # the DataLoader pins a batch by calling its pin_memory method; check that this
+    # reaches every tensor of a batch produced by collate_conformers
+    from dataclasses import fields
+
+    from torch.utils.data._utils.pin_memory import pin_memory
+
+    from modelforge.dataset.dataset import Metadata, NNPInput, collate_conformers
+
+    def _conformer(number_of_atoms: int, idx: int) -> BatchData:
+        return BatchData(
+            NNPInput(
+                atomic_numbers=torch.ones(number_of_atoms, dtype=torch.int64),
+                positions=torch.rand(number_of_atoms, 3),
+                atomic_subsystem_indices=torch.zeros(
+                    number_of_atoms, dtype=torch.int32
+                ),
+                total_charge=torch.tensor([0], dtype=torch.int32),
+            ),
+            Metadata(
+                E=torch.tensor([1.0]),
+                atomic_subsystem_counts=torch.tensor([number_of_atoms]),
+                atomic_subsystem_indices_referencing_dataset=torch.tensor([idx]),
+                number_of_atoms=number_of_atoms,
+                F=torch.rand(number_of_atoms, 3),
+            ),
+        )
+
+    batch = collate_conformers([_conformer(3, 0), _conformer(2, 1)])
+    positions_required_grad = batch.nnp_input.positions.requires_grad
+
+    # pinning requires an accelerator; record the calls instead
+    pinned = []
+
+    def fake_pin_memory(self, *args, **kwargs):
+        copy = self.detach().clone()
+        pinned.append(copy)
+        return copy
+
+    monkeypatch.setattr(torch.Tensor, "pin_memory", fake_pin_memory)
+
+    pinned_batch = pin_memory(batch)
+    assert isinstance(pinned_batch, BatchData)
+
+    for container in (pinned_batch.nnp_input, pinned_batch.metadata):
+        for field in fields(container):
+            value = getattr(container, field.name)
+            if isinstance(value, torch.Tensor):
+                assert any(value is tensor for tensor in pinned), field.name
+
+    # the positions remain a leaf tensor that tracks gradients
+    assert pinned_batch.nnp_input.positions.is_leaf
+    assert pinned_batch.nnp_input.positions.requires_grad == positions_required_grad
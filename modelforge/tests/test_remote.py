@@ -84,6 +84,101 @@ def test_fetch_record_id():
         fetch_url_from_doi(doi="10.5281/zenodo.3588339", timeout=0.0000000000001)
 
 
+def test_fetch_url_from_doi_is_cached(monkeypatch):
+    from modelforge.utils.remote import _session
+
+    class FakeResponse:
+        ok = True
+        status_code = 200
+        url = "https://zenodo.org/records/0000000"
+
+    calls = []
+
+    def fake_head(url, allow_redirects, timeout):
+        calls.append(url)
+        return FakeResponse()
+
+    monkeypatch.setattr(_session(), "head", fake_head)
+    fetch_url_from_doi.cache_clear()
+
+    # repeated lookups of the same DOI only query doi.org once
+    for _ in range(3):
+        assert fetch_url_from_doi(doi="10.5281/zenodo.0000000") == FakeResponse.url
+    assert calls == ["https://dx.doi.org/10.5281/zenodo.0000000"]
+
+    # a failed lookup is not cached
+    FakeResponse.ok = False
+    with pytest.raises(Exception):
+        fetch_url_from_doi(doi="10.5281/zenodo.0000001")
+    FakeResponse.ok = True
+    assert fetch_url_from_doi(doi="10.5281/zenodo.0000001") == FakeResponse.url
+    assert len(calls) == 3
+
+    fetch_url_from_doi.cache_clear()
+
+
+def test_fetch_url_from_doi_falls_back_to_get(monkeypatch):
+    from modelforge.utils.remote import _session
+
+    class FakeResponse:
+        def __init__(self, status_code, url):
+            self.status_code = status_code
+            self.ok = status_code == 200
+            self.url = url
+
+    # the server refuses HEAD requests, so the url is resolved with a GET
+    monkeypatch.setattr(
+        _session(),
+        "head",
+        lambda url, allow_redirects, timeout: FakeResponse(405, url),
+    )
+    monkeypatch.setattr(
+        _session(), "get", lambda url, timeout: FakeResponse(200, "records/1")
+    )
+    fetch_url_from_doi.cache_clear()
+
+    assert fetch_url_from_doi(doi="10.5281/zenodo.1") == "records/1"
+
+    fetch_url_from_doi.cache_clear()
+
+
+def test_fetch_urls_from_dois(monkeypatch):
+    import threading
+
+    import requests
+
+    class FakeResponse:
+        ok = True
+        status_code = 200
+
+        def __init__(self, url):
+            self.url = url.replace("https://dx.doi.org/10.5281/zenodo.", "records/")
+
+    sessions = {}
+
+    def fake_head(self, url, allow_redirects, timeout):
+        sessions.setdefault(threading.get_ident(), set()).add(id(self))
+        return FakeResponse(url)
+
+    # the DOIs are resolved in worker threads, each with its own session,
+    # so the method is replaced on the class rather than on a single session
+    monkeypatch.setattr(requests.Session, "head", fake_head)
+    fetch_url_from_doi.cache_clear()
+
+    dois = ["10.5281/zenodo.2", "10.5281/zenodo.1", "10.5281/zenodo.2"]
+    urls = fetch_urls_from_dois(dois)
+    assert list(urls) == ["10.5281/zenodo.2", "10.5281/zenodo.1"]
+    assert urls["10.5281/zenodo.1"] == "records/1"
+    assert urls["10.5281/zenodo.2"] == "records/2"
+
+    # no session is shared between threads
+    assert all(len(ids) == 1 for ids in sessions.values())
+    all_ids = [i for ids in sessions.values() for i in ids]
+    assert len(all_ids) == len(set(all_ids))
+
+    fetch_url_from_doi.cache_clear()
+
+
 def test_md5_calculation(prep_temp_dir):
     url = "https://zenodo.org/records/3401581/files/PTC-CMC/atools_ml-v0.1.zip"
     zenodo_checksum = "194cde222565dca8657d8521e5df1fd8"
@@ -107,6 +107,9 @@ def setup_modelforge_painn_representation(
 
 
 @pytest.mark.xfail
+# the test reseeds the global random number generator repeatedly to initialize
+# both models identically; restore its state afterwards so other tests are unaffected
+@torch.random.fork_rng(devices=[])
 def test_painn_representation_implementation():
     # ---------------------------------------- #
     # test the implementation of the representation part of the PaiNN model
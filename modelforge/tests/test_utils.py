@@ -531,6 +531,26 @@ def test_welford():
         assert np.isclose(online_estimator.stddev / target_stddev, 1.0, rtol=1e-1)
 
 
+def test_rotation_matrix_from_quaternion_keeps_graph():
+    """
+    Test that the rotation matrix used in the equivariance tests stays attached
+    to the autograd graph of the quaternion it is constructed from.
+    """
+    from modelforge.tests.helper_functions import rotation_matrix_from_quaternion
+
+    torch.manual_seed(0)
+    q = torch.randn(4, requires_grad=True)
+    R = rotation_matrix_from_quaternion(q / q.norm())
+    assert R.requires_grad
+
+    # a proper rotation is orthogonal
+    assert torch.allclose(R @ R.T, torch.eye(3, dtype=R.dtype), atol=1e-6)
+
+    R.sum().backward()
+    assert q.grad is not None
+    assert torch.all(torch.isfinite(q.grad))
+
+
 @pytest.mark.skipif(
     ON_MACOS and IN_GITHUB_ACTIONS,
     reason="Test is flaky on the MacOS CI runners as it relies on spawning multiple threads. ",
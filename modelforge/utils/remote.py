@@ -1,8 +1,41 @@
 """Module for querying remote sources and fetching datafiles"""
 
+import threading
+from functools import lru_cache
 from typing import Optional, List, Dict
 from loguru import logger
 
+# requests sessions are not thread-safe, so each thread uses its own session
+_thread_local = threading.local()
+
+
+def _session():
+    """Return the requests session of the calling thread.
+
+    Reusing a session keeps the connections to doi.org and zenodo.org alive
+    between requests, rather than negotiating a new TLS connection for each.
+    Each thread gets its own session (e.g., the workers of fetch_urls_from_dois),
+    as a session mutates its cookies and adapter state on every request.
+    Connection and read errors are retried with a short backoff.
+    """
+    session = getattr(_thread_local, "session", None)
+    if session is not None:
+        return session
+
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(total=3, backoff_factor=0.3),
+    )
+    session.mount("https://", adapter)
+    _thread_local.session = session
+    return session
+
 
 def is_url(query: str, hostname: str) -> bool:
     """Validate if a string is a URL associated with a given domain.
@@ -38,9 +71,13 @@ def is_url(query: str, hostname: str) -> bool:
     return True
 
 
+@lru_cache(maxsize=128)
 def fetch_url_from_doi(doi: str, timeout: Optional[int] = 10) -> str:
     """Retrieve URL associated with a DOI.
 
+    Successful resolutions are cached for the lifetime of the process, as a DOI
+    always resolves to the same URL; failed requests raise and are not cached.
+
     Parameters
     ----------
     doi : str, required
@@ -71,8 +108,13 @@ def fetch_url_from_doi(doi: str, timeout: Optional[int] = 10) -> str:
     else:
         input_url = doi_org_url + doi
 
+    # only the final url of the redirect chain is needed, so follow the redirects
+    # with HEAD requests rather than downloading the landing page of the record
     try:
-        response = requests.get(input_url, timeout=timeout)
+        response = _session().head(input_url, allow_redirects=True, timeout=timeout)
+        if response.status_code == 405:
+            # the server does not support HEAD requests
+            response = _session().get(input_url, timeout=timeout)
     except requests.exceptions.ConnectTimeout:
         raise Exception("Fetching url for DOI timed out.")
 
@@ -82,6 +124,45 @@ def fetch_url_from_doi(doi: str, timeout: Optional[int] = 10) -> str:
     return response.url
 
 
+def fetch_urls_from_dois(
+    dois: List[str], timeout: Optional[int] = 10, max_workers: int = 8
+) -> Dict[str, str]:
+    """Retrieve the URLs associated with several DOIs.
+
+    The DOIs are resolved concurrently, as each resolution spends nearly all of its
+    time waiting on the network.
+
+    Parameters
+    ----------
+    dois : List[str], required
+        The DOIs to be considered.  These can be formatted as URLs.
+    timeout : int, optional, default=10
+        The number of seconds to wait to establish a connection
+    max_workers : int, optional, default=8
+        The maximum number of DOIs resolved at the same time.
+
+    Returns
+    -------
+    urls : Dict[str, str]
+        The target URL linked to each DOI, keyed by DOI.
+
+    Examples
+    --------
+    >>> fetch_urls_from_dois(dois=["10.5281/zenodo.3588339", "10.5281/zenodo.3401581"])
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    urls = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(fetch_url_from_doi, doi, timeout): doi for doi in set(dois)
+        }
+        for future in as_completed(futures):
+            urls[futures[future]] = future.result()
+
+    return {doi: urls[doi] for doi in dois}
+
+
 def calculate_md5_checksum(file_name: str, file_path: str) -> str:
     import hashlib
     import os
@@ -113,7 +194,6 @@ def download_from_url(
     force_download=False,
 ):
 
-    import requests
     import os
     from tqdm import tqdm
 
@@ -140,7 +220,7 @@ def download_from_url(
             f"Downloading datafile from {url} to {output_path}/{output_filename}."
         )
 
-        r = requests.get(url, stream=True)
+        r = _session().get(url, stream=True)
 
         os.makedirs(output_path, exist_ok=True)
         if length is not None: